@@ -9,27 +9,164 @@ Features:
 """
 
 import os
+import errno
 import json
+import select
 import socket
 import asyncio
-import subprocess
 import time
+import re
+import fcntl
+import struct
+import threading
+import functools
+import contextlib
+import ctypes
+import ctypes.util
 from pathlib import Path
 from typing import Any
 
 import decky
 
-# Import paho-mqtt from py_modules
+# Bound once so log calls skip the module attribute lookup
+_log = decky.logger
+
+# Import paho-mqtt from py_modules; guarded so plugin reloads don't stack duplicate entries
 import sys
-sys.path.insert(0, os.path.join(decky.DECKY_PLUGIN_DIR, "py_modules"))
+PY_MODULES_PATH = os.path.join(decky.DECKY_PLUGIN_DIR, "py_modules")
+if PY_MODULES_PATH not in sys.path:
+    sys.path.insert(0, PY_MODULES_PATH)
 import paho.mqtt.client as mqtt
 
+# Prefer a C JSON codec when one is available (orjson, then msgspec); both
+# emit bytes directly, which paho accepts without re-encoding
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+
+    def _dumps_indented(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    try:
+        import msgspec
+        _dumps = msgspec.json.encode
+        _loads = msgspec.json.decode
+
+        def _dumps_indented(obj: Any) -> bytes:
+            return msgspec.json.format(msgspec.json.encode(obj), indent=2)
+    except ImportError:
+        _loads = json.loads
+        # json.dumps builds a fresh JSONEncoder whenever it gets non-default
+        # options, so keep configured encoders around instead
+        _json_encoder = json.JSONEncoder(separators=(",", ":"))  # Compact, like the C encoders
+        _json_indented_encoder = json.JSONEncoder(indent=2)
+
+        def _dumps(obj: Any) -> bytes:
+            return _json_encoder.encode(obj).encode()
+
+        def _dumps_indented(obj: Any) -> bytes:
+            return _json_indented_encoder.encode(obj).encode()
+
 # Constants
 SETTINGS_FILE = "settings.json"
 MQTT_DISCOVERY_PREFIX = "homeassistant"
 STATE_TOPIC_PREFIX = "steamdeck"
-
-
+# Status payloads pre-encoded, since paho would otherwise encode the str on every heartbeat
+STATUS_ONLINE = b"online"
+STATUS_OFFLINE = b"offline"
+MQTT_CONNECT_TIMEOUT = 5.0  # Seconds to wait for the broker's CONNACK
+COLLECT_CACHE_TTL = 0.5  # Seconds a collected telemetry group is shared between callers
+MAX_PENDING_PUBLISHES = 64  # Queued-but-unsent messages after which telemetry ticks are skipped
+MIN_PUBLISH_INTERVAL = 5  # Seconds; same floor the frontend enforces
+MAX_IDLE_INTERVAL = 120  # Cap in seconds for the telemetry interval while readings are unchanged
+# Settings that change how or as whom we connect; anything else applies without a reconnect
+BROKER_KEYS = ("mqtt_host", "mqtt_port", "mqtt_username", "mqtt_password", "hostname")
+TELEMETRY_GROUPS = ("battery", "disk", "network", "game", "download")
+POWER_SUPPLY_PATH = "/sys/class/power_supply"
+SD_MOUNT_BASE = "/run/media"
+SIOCGIFADDR = 0x8915
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+NETLINK_KOBJECT_UEVENT = 15
+UEVENT_GROUP_KERNEL = 0x1
+BATTERY_REFRESH_INTERVAL = 60.0  # Seconds before battery readings are re-read without a uevent
+_PER_GB = 1.0 / (1 << 30)  # Multiplier from bytes to GiB
+# Decimals kept for disk GB figures, matching what existing Home Assistant entities have recorded
+DISK_GB_DECIMALS = 2
+_SANITIZE_TABLE = str.maketrans({" ": "_", "-": "_", ".": "_"})
+
+# Matches the running app in Steam's registry.vdf; applied to raw bytes to skip decoding
+_RUNNING_APPID_KEY = b'"RunningAppID"'
+_RUNNING_APPID_RE = re.compile(rb'"RunningAppID"\s+"(\d+)"')
+
+# Readings each collector starts from, and what a group reports when its collector fails
+EMPTY_READINGS = {
+    "battery": {"percent": None, "charging": False, "time_remaining_min": None},
+    "disk": {
+        "internal_free_gb": None,
+        "internal_total_gb": None,
+        "internal_percent_used": None,
+        "sd_free_gb": None,
+        "sd_total_gb": None,
+        "sd_percent_used": None,
+        "sd_mounted": False
+    },
+    "network": {"ip_wifi": None, "ip_ethernet": None, "ip_primary": None},
+    "game": {"game_name": None, "app_id": None, "is_running": False},
+    "download": {
+        "downloading": False,
+        "download_progress": None,
+        "download_rate_mbps": None,
+        "download_app_name": None
+    }
+}
+
+# Discovery definitions per telemetry group:
+# (component, object_id, entity name suffix, payload field, extra config)
+_BINARY_PAYLOADS = {"payload_on": "True", "payload_off": "False"}
+SENSOR_DEFINITIONS = {
+    "battery": (
+        ("sensor", "battery_percent", "Battery", "percent",
+         {"unit_of_measurement": "%", "device_class": "battery", "state_class": "measurement"}),
+        ("binary_sensor", "charging", "Charging", "charging",
+         {**_BINARY_PAYLOADS, "device_class": "battery_charging"}),
+        ("sensor", "battery_time_remaining", "Battery Time Remaining", "time_remaining_min",
+         {"unit_of_measurement": "min", "icon": "mdi:battery-clock"}),
+    ),
+    "disk": (
+        ("sensor", "disk_free_internal", "Internal Storage Free", "internal_free_gb",
+         {"unit_of_measurement": "GB", "icon": "mdi:harddisk"}),
+        ("sensor", "disk_used_internal", "Internal Storage Used", "internal_percent_used",
+         {"unit_of_measurement": "%", "icon": "mdi:harddisk"}),
+        ("sensor", "disk_free_sd", "SD Card Free", "sd_free_gb",
+         {"unit_of_measurement": "GB", "icon": "mdi:sd"}),
+        ("binary_sensor", "sd_mounted", "SD Card Mounted", "sd_mounted",
+         {**_BINARY_PAYLOADS, "icon": "mdi:sd"}),
+    ),
+    "network": (
+        ("sensor", "ip_primary", "IP Address", "ip_primary", {"icon": "mdi:ip-network"}),
+        ("sensor", "ip_wifi", "WiFi IP", "ip_wifi", {"icon": "mdi:wifi"}),
+        ("sensor", "ip_ethernet", "Ethernet IP", "ip_ethernet", {"icon": "mdi:ethernet"}),
+    ),
+    "game": (
+        ("sensor", "current_game", "Current Game", "game_name", {"icon": "mdi:gamepad-variant"}),
+        ("sensor", "current_appid", "Current App ID", "app_id", {"icon": "mdi:identifier"}),
+        ("binary_sensor", "game_running", "Game Running", "is_running",
+         {**_BINARY_PAYLOADS, "icon": "mdi:gamepad-variant"}),
+    ),
+    "download": (
+        ("binary_sensor", "downloading", "Downloading", "downloading",
+         {**_BINARY_PAYLOADS, "icon": "mdi:download"}),
+        ("sensor", "download_progress", "Download Progress", "download_progress",
+         {"unit_of_measurement": "%", "icon": "mdi:download"}),
+        ("sensor", "download_rate", "Download Rate", "download_rate_mbps",
+         {"unit_of_measurement": "Mbps", "icon": "mdi:speedometer"}),
+    ),
+}
+
+
+@functools.cache
 def get_default_hostname() -> str:
     """Get the Steam Deck hostname, defaulting to 'steamdeck' if unavailable."""
     try:
@@ -41,7 +178,80 @@ def get_default_hostname() -> str:
 
 def sanitize_identifier(name: str) -> str:
     """Sanitize a string to be used as an identifier (lowercase, underscores)."""
-    return name.lower().replace(" ", "_").replace("-", "_").replace(".", "_")
+    return name.lower().translate(_SANITIZE_TABLE)
+
+
+def _disk_metrics(stat: os.statvfs_result) -> tuple[float, float, float]:
+    """Convert a statvfs result into (free GB, total GB, percent used)."""
+    total = stat.f_blocks * stat.f_frsize
+    free = stat.f_bavail * stat.f_frsize
+    percent_used = round((total - free) / total * 100, 1) if total > 0 else 0
+    return round(free * _PER_GB, DISK_GB_DECIMALS), round(total * _PER_GB, DISK_GB_DECIMALS), percent_used
+
+
+def _read_sysfs(path: str) -> bytes:
+    """Read a small sysfs attribute file, returning its stripped raw bytes.
+
+    Uses raw os.open/os.read, skipping the buffered file object entirely;
+    sysfs attributes fit comfortably in a single 64 byte read.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, 64).strip()
+    finally:
+        os.close(fd)
+
+
+def _open_netlink(protocol: int, groups: int) -> socket.socket:
+    """Open a non-blocking netlink socket subscribed to the given multicast groups."""
+    sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, protocol)
+    try:
+        sock.bind((0, groups))
+        sock.setblocking(False)
+    except Exception:
+        sock.close()
+        raise
+    return sock
+
+
+def _drain_netlink(sock: socket.socket, needle: bytes = b"") -> bool:
+    """Drain queued netlink messages, reporting whether any of them contained `needle`."""
+    changed = False
+    try:
+        while data := sock.recv(65536):
+            if needle in data:
+                changed = True
+    except BlockingIOError:
+        pass
+    except OSError:
+        # Receive queue overflowed (ENOBUFS); events were lost, so resync
+        changed = True
+    return changed
+
+
+class _SockaddrIn(ctypes.Structure):
+    """struct sockaddr_in; only read once sin_family is known to be AF_INET."""
+    _fields_ = [
+        ("sin_family", ctypes.c_ushort),
+        ("sin_port", ctypes.c_uint16),
+        ("sin_addr", ctypes.c_ubyte * 4),
+        ("sin_zero", ctypes.c_ubyte * 8)
+    ]
+
+
+class _Ifaddrs(ctypes.Structure):
+    """struct ifaddrs from getifaddrs(3)."""
+
+
+_Ifaddrs._fields_ = [
+    ("ifa_next", ctypes.POINTER(_Ifaddrs)),
+    ("ifa_name", ctypes.c_char_p),
+    ("ifa_flags", ctypes.c_uint),
+    ("ifa_addr", ctypes.POINTER(_SockaddrIn)),
+    ("ifa_netmask", ctypes.c_void_p),
+    ("ifa_ifu", ctypes.c_void_p),
+    ("ifa_data", ctypes.c_void_p)
+]
 
 
 class MQTTClient:
@@ -56,6 +266,17 @@ class MQTTClient:
         self.password = ""
         self.hostname = ""
         self.status_topic = ""
+        # Bumped on every accepted CONNECT, including paho's automatic reconnects
+        self.session = 0
+        # Set by on_connect once the broker answers the CONNECT
+        self._connect_event = threading.Event()
+        # Optional callable run on paho's network thread after every accepted
+        # CONNECT, including automatic reconnects
+        self.on_connected = None
+        # Messages handed to paho that on_publish hasn't reported as sent yet;
+        # touched from both the caller's thread and paho's network thread
+        self._pending = 0
+        self._pending_lock = threading.Lock()
 
     def configure(self, host: str, port: int, username: str, password: str, hostname: str = ""):
         """Configure MQTT connection parameters."""
@@ -73,6 +294,7 @@ class MQTTClient:
             if self.client:
                 self.disconnect()
 
+            self._connect_event.clear()
             self.client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
 
             if self.username and self.password:
@@ -82,47 +304,68 @@ class MQTTClient:
             if self.status_topic:
                 self.client.will_set(
                     topic=self.status_topic,
-                    payload="offline",
+                    payload=STATUS_OFFLINE,
                     qos=1,
                     retain=True
                 )
-                decky.logger.info(f"Last Will message set for topic: {self.status_topic}")
+                _log.info("Last Will message set for topic: %s", self.status_topic)
 
             def on_connect(client, userdata, flags, reason_code, properties):
                 if reason_code == 0:
                     self.connected = True
-                    decky.logger.info(f"Connected to MQTT broker at {self.host}:{self.port}")
+                    self.session += 1
+                    # paho drops unsent packets on reconnect without calling on_publish
+                    with self._pending_lock:
+                        self._pending = 0
+                    # Disable Nagle so small discovery/telemetry packets go out immediately;
+                    # the send buffer is left to the kernel's autotuning
+                    sock = client.socket()
+                    if sock is not None:
+                        try:
+                            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                        except (OSError, AttributeError):
+                            pass
+                    _log.info("Connected to MQTT broker at %s:%s", self.host, self.port)
                     # Publish initial online status with QoS 1 for reliability
                     if self.status_topic:
-                        result = self.publish(self.status_topic, "online", retain=True, qos=1)
+                        result = self.publish(self.status_topic, STATUS_ONLINE, retain=True, qos=1)
                         if result:
-                            decky.logger.info(f"Published initial online status to {self.status_topic}")
+                            _log.info("Published initial online status to %s", self.status_topic)
                         else:
-                            decky.logger.warning(f"Failed to publish initial online status to {self.status_topic}")
+                            _log.warning("Failed to publish initial online status to %s", self.status_topic)
+                    if self.on_connected:
+                        try:
+                            self.on_connected()
+                        except Exception:
+                            pass
                 else:
                     self.connected = False
-                    decky.logger.error(f"Failed to connect to MQTT broker: {reason_code}")
+                    _log.error("Failed to connect to MQTT broker: %s", reason_code)
+                self._connect_event.set()
 
             def on_disconnect(client, userdata, flags, reason_code, properties):
                 self.connected = False
-                decky.logger.info("Disconnected from MQTT broker")
+                _log.info("Disconnected from MQTT broker")
+
+            def on_publish(client, userdata, mid, reason_code, properties):
+                with self._pending_lock:
+                    self._pending -= 1
 
             self.client.on_connect = on_connect
             self.client.on_disconnect = on_disconnect
+            self.client.on_publish = on_publish
 
             self.client.connect(self.host, self.port, keepalive=60)
+            # paho's own network thread rather than asyncio add_reader/add_writer:
+            # it handles keepalives and automatic reconnects, and lets the CONNACK
+            # and publish_reliable waits block without stalling the event loop
             self.client.loop_start()
 
-            # Wait briefly for connection
-            for _ in range(10):
-                if self.connected:
-                    return True
-                import time
-                time.sleep(0.1)
-
+            # Returns as soon as on_connect fires, so the timeout only bounds a silent broker
+            self._connect_event.wait(timeout=MQTT_CONNECT_TIMEOUT)
             return self.connected
         except Exception as e:
-            decky.logger.error(f"Error connecting to MQTT: {e}")
+            _log.error("Error connecting to MQTT: %s", e)
             self.connected = False
             return False
 
@@ -132,248 +375,553 @@ class MQTTClient:
             try:
                 # Publish offline status before clean disconnect with QoS 1 for reliability
                 if self.connected and self.status_topic:
-                    result = self.publish(self.status_topic, "offline", retain=True, qos=1)
+                    # Wait for the broker's ack so the message is sent before disconnecting
+                    result = self.publish_reliable(self.status_topic, STATUS_OFFLINE, retain=True)
                     if result:
-                        decky.logger.info(f"Published offline status to {self.status_topic}")
-                        # Brief wait to ensure message is sent before disconnecting
-                        time.sleep(0.1)
+                        _log.info("Published offline status to %s", self.status_topic)
                     else:
-                        decky.logger.warning(f"Failed to publish offline status to {self.status_topic}")
+                        _log.warning("Failed to publish offline status to %s", self.status_topic)
                 self.client.loop_stop()
                 self.client.disconnect()
             except Exception:
                 pass
             self.client = None
         self.connected = False
+        self._connect_event.clear()
+
+    def publish(self, topic: str, payload: str | bytes, retain: bool = False, qos: int = 0) -> bool:
+        """Publish a message to an MQTT topic.
 
-    def publish(self, topic: str, payload: str, retain: bool = False, qos: int = 0) -> bool:
-        """Publish a message to an MQTT topic."""
+        Only queues the message; it never waits for a broker ack. Telemetry
+        should stay on QoS 0 through here so publishes don't block the caller.
+        """
         if not self.client or not self.connected:
             return False
         try:
-            result = self.client.publish(topic, payload, qos=qos, retain=retain)
-            return result.rc == mqtt.MQTT_ERR_SUCCESS
+            return self._queue(topic, payload, qos, retain).rc == mqtt.MQTT_ERR_SUCCESS
         except Exception as e:
-            decky.logger.error(f"Error publishing to {topic}: {e}")
+            _log.error("Error publishing to %s: %s", topic, e)
+            return False
+
+    def publish_reliable(self, topic: str, payload: str | bytes, retain: bool = False, timeout: float = 1.0) -> bool:
+        """Publish a message with QoS 1 and block until the broker acknowledges it.
+
+        Reserved for status transitions that must land before the caller moves on.
+        Must not be called from paho callbacks, which run on the network thread.
+        """
+        if not self.client or not self.connected:
+            return False
+        try:
+            result = self._queue(topic, payload, 1, retain)
+            result.wait_for_publish(timeout=timeout)
+            return result.is_published()
+        except Exception as e:
+            _log.error("Error publishing to %s: %s", topic, e)
+            return False
+
+    def publish_many(self, messages: list[tuple[str, str | bytes, bool, int]]) -> bool:
+        """Publish several (topic, payload, retain, qos) messages back to back.
+
+        Each message is still queued through its own paho publish() call;
+        paho's network thread writes them out as it drains its queue, often
+        in the same wakeup, but nothing here forces a single write.
+        """
+        if not self.client or not self.connected:
             return False
+        success = True
+        for topic, payload, retain, qos in messages:
+            try:
+                result = self._queue(topic, payload, qos, retain)
+                success = success and result.rc == mqtt.MQTT_ERR_SUCCESS
+            except Exception as e:
+                _log.error("Error publishing to %s: %s", topic, e)
+                success = False
+        return success
+
+    def _queue(self, topic: str, payload: str | bytes, qos: int, retain: bool) -> mqtt.MQTTMessageInfo:
+        """Hand a message to paho, counting it as pending until on_publish reports it sent."""
+        # Counted before publish() so an on_publish racing in from the network thread can't go first
+        with self._pending_lock:
+            self._pending += 1
+        try:
+            result = self.client.publish(topic, payload, qos=qos, retain=retain)
+        except Exception:
+            with self._pending_lock:
+                self._pending -= 1
+            raise
+        if result.rc != mqtt.MQTT_ERR_SUCCESS:
+            with self._pending_lock:
+                self._pending -= 1
+        return result
+
+    def pending_publishes(self) -> int:
+        """Number of published messages still waiting to be written to the broker."""
+        # QoS 1 messages resent after a reconnect can report in after the reset
+        return max(self._pending, 0)
 
     def publish_heartbeat(self) -> bool:
         """Publish a heartbeat message to keep the status online."""
         if self.status_topic and self.connected:
-            # Use QoS 1 for heartbeat to ensure delivery of status updates
-            return self.publish(self.status_topic, "online", retain=True, qos=1)
+            # QoS 0: heartbeats are redundant by design and the retained value already
+            # covers late subscribers, so a PUBACK per tick buys nothing. The one-shot
+            # online/offline transitions in connect/disconnect stay on QoS 1
+            return self.publish(self.status_topic, STATUS_ONLINE, retain=True, qos=0)
         return False
 
 
 class TelemetryCollector:
     """Collects telemetry data from the Steam Deck."""
 
-    @staticmethod
-    def get_battery_info() -> dict:
-        """Get battery information from /sys/class/power_supply/."""
-        result = {
-            "percent": None,
-            "charging": False,
-            "time_remaining_min": None
-        }
-
-        power_supply_path = Path("/sys/class/power_supply")
-        battery_path = None
+    # Device paths are stable for the life of the process, so they are
+    # discovered once and only rediscovered when they disappear
+    _battery_path: str | None = None
+    _sd_mount_path: str | None = None
+    _registry_file: str | None = None
+
+    # Netlink route socket used only as a change notifier for interface addresses
+    _netlink_sock: socket.socket | None = None
+    _netlink_failed = False
+    _network_cache: dict | None = None
+    _network_lock = threading.Lock()
+    _libc: ctypes.CDLL | None = None
+
+    # Kernel uevents announce power_supply changes; readings are reused until one
+    # arrives or BATTERY_REFRESH_INTERVAL passes
+    _uevent_sock: socket.socket | None = None
+    _uevent_failed = False
+    _battery_cache: dict | None = None
+    _battery_read_at = 0.0
+    _battery_lock = threading.Lock()
+    # Battery attribute name -> descriptor kept open between reads; sysfs
+    # regenerates the value on every read from offset 0
+    _battery_fds: dict[str, int] = {}
+
+    # /proc/self/mounts polls readable with POLLPRI whenever the mount table changes
+    _mounts_fd: int | None = None
+    _mounts_poll = None
+    _mounts_failed = False
+    _disk_lock = threading.Lock()
+
+    # group -> (monotonic time collected, result); lets the frontend's get_telemetry
+    # and the telemetry loop share one read when they land together
+    _collect_cache: dict[str, tuple[float, dict]] = {}
+
+    @classmethod
+    def _find_battery_path(cls) -> str | None:
+        """Find the battery device (usually BAT0 or BAT1), caching the result."""
+        if cls._battery_path is not None:
+            return cls._battery_path
 
-        # Find battery device (usually BAT0 or BAT1)
-        if power_supply_path.exists():
-            for device in power_supply_path.iterdir():
-                device_type_file = device / "type"
-                if device_type_file.exists():
+        try:
+            with os.scandir(POWER_SUPPLY_PATH) as it:
+                for entry in it:
                     try:
-                        device_type = device_type_file.read_text().strip()
-                        if device_type == "Battery":
-                            battery_path = device
+                        if _read_sysfs(entry.path + "/type") == b"Battery":
+                            cls._battery_path = entry.path
                             break
                     except Exception:
                         pass
+        except Exception:
+            pass
+
+        return cls._battery_path
 
+    @classmethod
+    def _battery_changed(cls) -> bool:
+        """Check whether a power_supply uevent arrived since the last call.
+
+        Without a uevent socket every call reports a change.
+        """
+        if cls._uevent_sock is None:
+            if cls._uevent_failed:
+                return True
+            try:
+                cls._uevent_sock = _open_netlink(NETLINK_KOBJECT_UEVENT, UEVENT_GROUP_KERNEL)
+            except Exception as e:
+                _log.warning("Uevents unavailable, polling battery: %s", e)
+                cls._uevent_failed = True
+            return True
+        return _drain_netlink(cls._uevent_sock, b"SUBSYSTEM=power_supply")
+
+    @classmethod
+    def _read_battery_attr(cls, name: str) -> bytes:
+        """Read a battery sysfs attribute through a cached descriptor."""
+        fd = cls._battery_fds.get(name)
+        if fd is None:
+            fd = os.open(cls._battery_path + "/" + name, os.O_RDONLY)
+            cls._battery_fds[name] = fd
+        return os.pread(fd, 64, 0).strip()
+
+    @classmethod
+    def _close_battery_fds(cls):
+        """Close the cached battery attribute descriptors."""
+        for fd in cls._battery_fds.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        cls._battery_fds.clear()
+
+    @classmethod
+    def get_battery_info(cls) -> dict:
+        """Get battery information, re-reading sysfs only after a uevent or the refresh interval."""
+        with cls._battery_lock:
+            now = time.monotonic()
+            if (cls._battery_changed() or cls._battery_cache is None
+                    or now - cls._battery_read_at >= BATTERY_REFRESH_INTERVAL):
+                cls._battery_cache = cls._read_battery_info()
+                cls._battery_read_at = now
+            return dict(cls._battery_cache)
+
+    @classmethod
+    def _read_battery_info(cls) -> dict:
+        """Read battery information from /sys/class/power_supply/."""
+        result = dict(EMPTY_READINGS["battery"])
+
+        battery_path = cls._find_battery_path()
         if not battery_path:
             return result
 
         # Read capacity (percentage)
         try:
-            capacity_file = battery_path / "capacity"
-            if capacity_file.exists():
-                result["percent"] = int(capacity_file.read_text().strip())
+            result["percent"] = int(cls._read_battery_attr("capacity"))
+        except OSError as e:
+            if e.errno == errno.ENODEV or not os.path.isdir(battery_path):
+                # Battery device went away (held descriptors then fail with ENODEV);
+                # rescan and reopen on the next call
+                cls._close_battery_fds()
+                cls._battery_path = None
+                return result
+            # Otherwise this supply just has no readable capacity; leave it unset
         except Exception:
             pass
 
         # Read charging status
         try:
-            status_file = battery_path / "status"
-            if status_file.exists():
-                status = status_file.read_text().strip()
-                result["charging"] = status in ("Charging", "Full")
+            status = cls._read_battery_attr("status")
+            result["charging"] = status in (b"Charging", b"Full")
         except Exception:
             pass
 
         # Try to calculate time remaining
         try:
-            energy_now_file = battery_path / "energy_now"
-            power_now_file = battery_path / "power_now"
-            energy_full_file = battery_path / "energy_full"
-
-            if energy_now_file.exists() and power_now_file.exists():
-                energy_now = int(energy_now_file.read_text().strip())
-                power_now = int(power_now_file.read_text().strip())
-
-                if power_now > 0:
-                    if result["charging"] and energy_full_file.exists():
-                        energy_full = int(energy_full_file.read_text().strip())
-                        hours = (energy_full - energy_now) / power_now
-                    else:
-                        hours = energy_now / power_now
-                    result["time_remaining_min"] = int(hours * 60)
+            energy_now = int(cls._read_battery_attr("energy_now"))
+            power_now = int(cls._read_battery_attr("power_now"))
+
+            if power_now > 0:
+                energy_full = None
+                if result["charging"]:
+                    try:
+                        energy_full = int(cls._read_battery_attr("energy_full"))
+                    except FileNotFoundError:
+                        pass
+                if energy_full is not None:
+                    hours = (energy_full - energy_now) / power_now
+                else:
+                    hours = energy_now / power_now
+                result["time_remaining_min"] = int(hours * 60)
         except Exception:
             pass
 
         return result
 
-    @staticmethod
-    def get_disk_info() -> dict:
+    @classmethod
+    def _find_sd_mount(cls) -> tuple[str, os.statvfs_result] | None:
+        """Scan /run/media/<user>/ for the first mounted filesystem with a non-zero size."""
+        try:
+            # scandir's d_type answers is_dir() without an extra stat per entry
+            with os.scandir(SD_MOUNT_BASE) as users:
+                for user_dir in users:
+                    if not user_dir.is_dir():
+                        continue
+                    with os.scandir(user_dir.path) as mounts:
+                        for mount_point in mounts:
+                            # Check if it's a different device from root
+                            try:
+                                stat = os.statvfs(mount_point.path)
+                                if stat.f_blocks * stat.f_frsize > 0:
+                                    return mount_point.path, stat
+                            except Exception:
+                                pass
+        except Exception:
+            pass
+        return None
+
+    @classmethod
+    def _mounts_changed(cls) -> bool:
+        """Check whether the mount table changed since the last call.
+
+        Without a pollable /proc/self/mounts every call reports a change.
+        """
+        if cls._mounts_poll is None:
+            if cls._mounts_failed:
+                return True
+            try:
+                cls._mounts_fd = os.open("/proc/self/mounts", os.O_RDONLY)
+                poller = select.poll()
+                poller.register(cls._mounts_fd, select.POLLPRI | select.POLLERR)
+                cls._mounts_poll = poller
+            except Exception as e:
+                _log.warning("Mount table not pollable, rescanning for SD card: %s", e)
+                cls._mounts_failed = True
+            return True
+        return bool(cls._mounts_poll.poll(0))
+
+    @classmethod
+    def get_disk_info(cls) -> dict:
         """Get disk usage information for internal storage and SD card."""
-        result = {
-            "internal_free_gb": None,
-            "internal_total_gb": None,
-            "internal_percent_used": None,
-            "sd_free_gb": None,
-            "sd_total_gb": None,
-            "sd_percent_used": None,
-            "sd_mounted": False
-        }
+        with cls._disk_lock:
+            return cls._read_disk_info()
+
+    @classmethod
+    def _read_disk_info(cls) -> dict:
+        """Get disk usage information for internal storage and SD card."""
+        result = dict(EMPTY_READINGS["disk"])
 
         # Internal storage (root filesystem)
         try:
-            stat = os.statvfs("/")
-            total = stat.f_blocks * stat.f_frsize
-            free = stat.f_bavail * stat.f_frsize
-            used = total - free
-            result["internal_free_gb"] = round(free / (1024 ** 3), 2)
-            result["internal_total_gb"] = round(total / (1024 ** 3), 2)
-            result["internal_percent_used"] = round((used / total) * 100, 1) if total > 0 else 0
+            (result["internal_free_gb"],
+             result["internal_total_gb"],
+             result["internal_percent_used"]) = _disk_metrics(os.statvfs("/"))
         except Exception:
             pass
 
-        # SD card (usually mounted under /run/media/)
-        sd_mount_base = Path("/run/media")
-        if sd_mount_base.exists():
+        # SD card (usually mounted under /run/media/); /run/media is only
+        # walked again once the mount table changes or the cached mount fails
+        mounts_changed = cls._mounts_changed()
+        stat = None
+        if cls._sd_mount_path is not None:
+            # Re-verify the last seen mount instead of walking /run/media again
             try:
-                for user_dir in sd_mount_base.iterdir():
-                    for mount_point in user_dir.iterdir():
-                        # Check if it's a different device from root
-                        try:
-                            stat = os.statvfs(str(mount_point))
-                            total = stat.f_blocks * stat.f_frsize
-                            if total > 0:
-                                free = stat.f_bavail * stat.f_frsize
-                                used = total - free
-                                result["sd_free_gb"] = round(free / (1024 ** 3), 2)
-                                result["sd_total_gb"] = round(total / (1024 ** 3), 2)
-                                result["sd_percent_used"] = round((used / total) * 100, 1)
-                                result["sd_mounted"] = True
-                                break
-                        except Exception:
-                            pass
-                    if result["sd_mounted"]:
-                        break
+                if not mounts_changed or os.path.ismount(cls._sd_mount_path):
+                    stat = os.statvfs(cls._sd_mount_path)
+                    if stat.f_blocks * stat.f_frsize == 0:
+                        stat = None
             except Exception:
-                pass
+                stat = None
+            if stat is None:
+                cls._sd_mount_path = None
+                mounts_changed = True
+
+        if stat is None and mounts_changed:
+            found = cls._find_sd_mount()
+            if found:
+                cls._sd_mount_path, stat = found
+
+        if stat is not None:
+            (result["sd_free_gb"],
+             result["sd_total_gb"],
+             result["sd_percent_used"]) = _disk_metrics(stat)
+            result["sd_mounted"] = True
 
         return result
 
-    @staticmethod
-    def get_network_info() -> dict:
-        """Get network information including IP addresses."""
-        result = {
-            "ip_wifi": None,
-            "ip_ethernet": None,
-            "ip_primary": None
-        }
-
-        try:
-            # Use ip command to get addresses
-            output = subprocess.check_output(
-                ["ip", "-j", "addr"],
-                text=True,
-                timeout=5
-            )
-            interfaces = json.loads(output)
-
-            for iface in interfaces:
-                name = iface.get("ifname", "")
-                addr_info = iface.get("addr_info", [])
+    @classmethod
+    def _get_ipv4_addresses(cls) -> list[tuple[str, str]]:
+        """List (interface, IPv4 address) pairs using libc's getifaddrs(3)."""
+        if cls._libc is None:
+            cls._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
 
-                for addr in addr_info:
-                    if addr.get("family") == "inet":
-                        ip = addr.get("local")
-                        if ip and not ip.startswith("127."):
-                            if name.startswith("wl"):
-                                result["ip_wifi"] = ip
-                            elif name.startswith("en") or name.startswith("eth"):
-                                result["ip_ethernet"] = ip
+        head = ctypes.POINTER(_Ifaddrs)()
+        if cls._libc.getifaddrs(ctypes.byref(head)) != 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
 
-                            if not result["ip_primary"]:
-                                result["ip_primary"] = ip
+        addresses = []
+        try:
+            node = head
+            while node:
+                ifa = node.contents
+                if ifa.ifa_addr and ifa.ifa_addr.contents.sin_family == socket.AF_INET:
+                    addresses.append((
+                        ifa.ifa_name.decode(errors="replace"),
+                        socket.inet_ntoa(bytes(ifa.ifa_addr.contents.sin_addr))
+                    ))
+                node = ifa.ifa_next
+        finally:
+            cls._libc.freeifaddrs(head)
+        return addresses
 
-        except Exception as e:
-            decky.logger.error(f"Error getting network info: {e}")
+    @staticmethod
+    def _get_ipv4_addresses_ioctl() -> list[tuple[str, str]]:
+        """List (interface, IPv4 address) pairs using SIOCGIFADDR ioctls."""
+        addresses = []
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            for _, name in socket.if_nameindex():
+                try:
+                    ifreq = fcntl.ioctl(sock.fileno(), SIOCGIFADDR, struct.pack("256s", name[:15].encode()))
+                except OSError:
+                    # Interface has no IPv4 address assigned
+                    continue
+                addresses.append((name, socket.inet_ntoa(ifreq[20:24])))
+        return addresses
+
+    @classmethod
+    def _network_changed(cls) -> bool:
+        """Check whether interface addresses may have changed since the last call.
+
+        The first call subscribes to netlink link/IPv4 address notifications;
+        later calls just drain the socket without blocking. Without netlink
+        every call reports a change, so addresses are always re-read.
+        """
+        if cls._netlink_sock is None:
+            if cls._netlink_failed:
+                return True
+            try:
+                cls._netlink_sock = _open_netlink(socket.NETLINK_ROUTE, RTMGRP_LINK | RTMGRP_IPV4_IFADDR)
+            except Exception as e:
+                _log.warning("Netlink unavailable, polling network addresses: %s", e)
+                cls._netlink_failed = True
+            return True
+        return _drain_netlink(cls._netlink_sock)
+
+    @classmethod
+    def close(cls):
+        """Release the sockets and descriptors held for change notifications."""
+        with cls._network_lock:
+            if cls._netlink_sock is not None:
+                cls._netlink_sock.close()
+                cls._netlink_sock = None
+            cls._network_cache = None
+        with cls._battery_lock:
+            if cls._uevent_sock is not None:
+                cls._uevent_sock.close()
+                cls._uevent_sock = None
+            cls._close_battery_fds()
+            cls._battery_cache = None
+        with cls._disk_lock:
+            if cls._mounts_fd is not None:
+                os.close(cls._mounts_fd)
+                cls._mounts_fd = None
+                cls._mounts_poll = None
+        cls._collect_cache.clear()
+
+    @classmethod
+    def get_network_info(cls) -> dict:
+        """Get network information including IP addresses.
+
+        Addresses are cached and only re-read after netlink reports a change.
+        """
+        with cls._network_lock:
+            if not cls._network_changed() and cls._network_cache is not None:
+                return dict(cls._network_cache)
+
+            result = dict(EMPTY_READINGS["network"])
 
-        return result
+            try:
+                try:
+                    addresses = cls._get_ipv4_addresses()
+                except Exception as e:
+                    # Fall back to per-interface ioctls if getifaddrs is unavailable
+                    _log.warning("getifaddrs failed, falling back to interface ioctls: %s", e)
+                    addresses = cls._get_ipv4_addresses_ioctl()
+
+                for name, ip in addresses:
+                    if not ip.startswith("127."):
+                        if name.startswith("wl"):
+                            result["ip_wifi"] = ip
+                        elif name.startswith("en") or name.startswith("eth"):
+                            result["ip_ethernet"] = ip
+
+                        if not result["ip_primary"]:
+                            result["ip_primary"] = ip
+
+                cls._network_cache = dict(result)
+            except Exception as e:
+                _log.error("Error getting network info: %s", e)
+                cls._network_cache = None
 
-    @staticmethod
-    def get_current_game() -> dict:
-        """Get current running game information."""
-        result = {
-            "game_name": None,
-            "app_id": None,
-            "is_running": False
-        }
+            return result
 
-        # Try to detect running game via Steam's local files
-        try:
-            # Check for running Steam apps
+    @classmethod
+    def _find_registry_file(cls) -> str:
+        """Resolve the path to Steam's registry.vdf, caching the result."""
+        if cls._registry_file is None:
             steam_path = Path.home() / ".steam" / "steam"
             if not steam_path.exists():
                 steam_path = Path.home() / ".local" / "share" / "Steam"
+            cls._registry_file = str(steam_path / "registry.vdf")
+        return cls._registry_file
 
-            # Try reading from steam's registry
-            registry_file = steam_path / "registry.vdf"
-            if registry_file.exists():
-                content = registry_file.read_text()
-                # Look for RunningAppID
-                import re
-                match = re.search(r'"RunningAppID"\s+"(\d+)"', content)
-                if match:
-                    app_id = int(match.group(1))
-                    if app_id > 0:
-                        result["app_id"] = app_id
-                        result["is_running"] = True
+    @classmethod
+    def get_current_game(cls) -> dict:
+        """Get current running game information."""
+        result = dict(EMPTY_READINGS["game"])
 
+        # Try to detect running game via Steam's local files
+        try:
+            # Try reading from steam's registry; unbuffered, since the whole file is
+            # read in one go and FileIO.readall() sizes its buffer from fstat
+            with open(cls._find_registry_file(), "rb", buffering=0) as f:
+                content = f.read()
+            # Look for RunningAppID: a plain substring scan locates the key,
+            # then the pattern is only matched at that offset
+            pos = content.find(_RUNNING_APPID_KEY)
+            match = _RUNNING_APPID_RE.match(content, pos) if pos >= 0 else None
+            if match:
+                app_id = int(match.group(1))
+                if app_id > 0:
+                    result["app_id"] = app_id
+                    result["is_running"] = True
+
+        except FileNotFoundError:
+            pass
         except Exception as e:
-            decky.logger.error(f"Error getting game info: {e}")
+            _log.error("Error getting game info: %s", e)
 
         return result
 
     @staticmethod
     def get_download_info() -> dict:
         """Get Steam download progress information."""
-        result = {
-            "downloading": False,
-            "download_progress": None,
-            "download_rate_mbps": None,
-            "download_app_name": None
-        }
+        result = dict(EMPTY_READINGS["download"])
 
         # Download detection requires deeper Steam integration
         # This is a placeholder for when Decky APIs provide this info
         return result
 
+    @classmethod
+    async def collect_all(cls, groups: tuple[str, ...] = TELEMETRY_GROUPS) -> dict:
+        """Collect the given telemetry groups concurrently on worker threads.
+
+        The collectors block on sysfs reads, statvfs and ioctls and share no
+        state, so running them in parallel keeps the event loop free and cuts
+        a tick down to the slowest collector rather than the sum of all.
+        """
+        collectors = {
+            "battery": cls.get_battery_info,
+            "disk": cls.get_disk_info,
+            "network": cls.get_network_info,
+            "game": cls.get_current_game,
+            "download": cls.get_download_info
+        }
+        now = time.monotonic()
+        telemetry = {}
+        stale = []
+        for group in groups:
+            cached = cls._collect_cache.get(group)
+            if cached is not None and now - cached[0] < COLLECT_CACHE_TTL:
+                telemetry[group] = cached[1]
+            else:
+                stale.append(group)
+
+        results = await asyncio.gather(
+            *(asyncio.to_thread(collectors[group]) for group in stale),
+            return_exceptions=True
+        )
+        # A failing collector only blanks its own group for this tick; callers
+        # (and the frontend) can rely on every requested group being present
+        now = time.monotonic()
+        for group, result in zip(stale, results):
+            if isinstance(result, Exception):
+                _log.error("Error collecting %s telemetry: %s", group, result)
+                telemetry[group] = dict(EMPTY_READINGS[group])
+            else:
+                telemetry[group] = result
+                cls._collect_cache[group] = (now, result)
+        # Keep the caller's group order in the bundle
+        return {group: telemetry[group] for group in groups}
+
 
 class HomeAssistantDiscovery:
     """Handles MQTT Discovery for Home Assistant."""
@@ -382,199 +930,218 @@ class HomeAssistantDiscovery:
         self.mqtt_client = mqtt_client
         self.hostname = sanitize_identifier(hostname)
         self.device_name = f"Steam Deck ({hostname})"
-
-    def get_device_info(self) -> dict:
-        """Get the device info block for MQTT Discovery."""
-        return {
+        # Constant topic/id fragments, joined with the per-call parts on publish
+        self._disc_prefix = f"{MQTT_DISCOVERY_PREFIX}/"
+        self._disc_suffix = f"/{self.hostname}_"
+        self._state_prefix = f"{STATE_TOPIC_PREFIX}/{self.hostname}/telemetry/"
+        self._unique_prefix = f"steamdeck_{self.hostname}_"
+        # With bundle_telemetry on, all groups are published together as one JSON object here
+        self._bundle_topic = self._state_prefix + "all"
+        # Per-group state topics, the default layout; used by every publish_states
+        # call and by discovery, so built once here
+        self._state_topics = {group: self._state_prefix + group for group in TELEMETRY_GROUPS}
+        # Hash of the last discovery payload published per config topic
+        self._last_config_hash: dict[str, int] = {}
+        # Hash of the last state payload published per state topic
+        self._last_state_hash: dict[str, int] = {}
+        # Broker session the hashes above belong to; a new session may have lost them
+        self._session = mqtt_client.session
+        # Discovery messages held back while inside batch()
+        self._pending: list[tuple[str, bytes, int]] | None = None
+        # Device block is immutable after init and shared by every discovery config
+        self._device_info = {
             "identifiers": [f"steamdeck_{self.hostname}"],
             "name": self.device_name,
             "manufacturer": "Valve",
             "model": "Steam Deck"
         }
+        # Config topic and unique_id for every known entity, built once up front
+        self._entity_ids = {
+            (component, object_id): (self._config_topic(component, object_id), self._unique_prefix + object_id)
+            for component, object_id in [("binary_sensor", "status")] + [
+                (definition[0], definition[1])
+                for definitions in SENSOR_DEFINITIONS.values()
+                for definition in definitions
+            ]
+        }
+
+    def get_device_info(self) -> dict:
+        """Get the device info block for MQTT Discovery."""
+        return self._device_info
+
+    def _config_topic(self, component: str, object_id: str) -> str:
+        """Build the MQTT Discovery config topic for an entity."""
+        return self._disc_prefix + component + self._disc_suffix + object_id + "/config"
+
+    def _discovery_message(self, component: str, object_id: str, config: dict) -> tuple[str, bytes]:
+        """Build the topic and serialized payload for an MQTT Discovery configuration."""
+        ids = self._entity_ids.get((component, object_id))
+        if ids is None:
+            ids = self._config_topic(component, object_id), self._unique_prefix + object_id
+        topic, unique_id = ids
+        config["device"] = self._device_info
+        config["unique_id"] = unique_id
+        return topic, _dumps(config)
 
     def publish_discovery_config(self, component: str, object_id: str, config: dict):
         """Publish an MQTT Discovery configuration."""
-        topic = f"{MQTT_DISCOVERY_PREFIX}/{component}/{self.hostname}_{object_id}/config"
-        config["device"] = self.get_device_info()
-        config["unique_id"] = f"steamdeck_{self.hostname}_{object_id}"
-        payload = json.dumps(config)
-        self.mqtt_client.publish(topic, payload, retain=True)
-
-    def publish_state(self, sensor_type: str, payload: dict):
-        """Publish state data to a topic."""
-        topic = f"{STATE_TOPIC_PREFIX}/{self.hostname}/telemetry/{sensor_type}"
-        self.mqtt_client.publish(topic, json.dumps(payload), retain=False)
-
-    def register_battery_sensors(self):
-        """Register battery-related sensors with Home Assistant."""
-        base_topic = f"{STATE_TOPIC_PREFIX}/{self.hostname}/telemetry/battery"
-
-        # Battery percentage
-        self.publish_discovery_config("sensor", "battery_percent", {
-            "name": f"{self.device_name} Battery",
-            "state_topic": base_topic,
-            "unit_of_measurement": "%",
-            "value_template": "{{ value_json.percent }}",
-            "device_class": "battery",
-            "state_class": "measurement"
-        })
-
-        # Charging status
-        self.publish_discovery_config("binary_sensor", "charging", {
-            "name": f"{self.device_name} Charging",
-            "state_topic": base_topic,
-            "value_template": "{{ value_json.charging }}",
-            "payload_on": "True",
-            "payload_off": "False",
-            "device_class": "battery_charging"
-        })
-
-        # Time remaining
-        self.publish_discovery_config("sensor", "battery_time_remaining", {
-            "name": f"{self.device_name} Battery Time Remaining",
-            "state_topic": base_topic,
-            "unit_of_measurement": "min",
-            "value_template": "{{ value_json.time_remaining_min }}",
-            "icon": "mdi:battery-clock"
-        })
-
-    def register_disk_sensors(self):
-        """Register disk-related sensors with Home Assistant."""
-        base_topic = f"{STATE_TOPIC_PREFIX}/{self.hostname}/telemetry/disk"
-
-        # Internal disk free
-        self.publish_discovery_config("sensor", "disk_free_internal", {
-            "name": f"{self.device_name} Internal Storage Free",
-            "state_topic": base_topic,
-            "unit_of_measurement": "GB",
-            "value_template": "{{ value_json.internal_free_gb }}",
-            "icon": "mdi:harddisk"
-        })
-
-        # Internal disk used percentage
-        self.publish_discovery_config("sensor", "disk_used_internal", {
-            "name": f"{self.device_name} Internal Storage Used",
-            "state_topic": base_topic,
-            "unit_of_measurement": "%",
-            "value_template": "{{ value_json.internal_percent_used }}",
-            "icon": "mdi:harddisk"
-        })
-
-        # SD card free
-        self.publish_discovery_config("sensor", "disk_free_sd", {
-            "name": f"{self.device_name} SD Card Free",
-            "state_topic": base_topic,
-            "unit_of_measurement": "GB",
-            "value_template": "{{ value_json.sd_free_gb }}",
-            "icon": "mdi:sd"
-        })
-
-        # SD card mounted
-        self.publish_discovery_config("binary_sensor", "sd_mounted", {
-            "name": f"{self.device_name} SD Card Mounted",
-            "state_topic": base_topic,
-            "value_template": "{{ value_json.sd_mounted }}",
-            "payload_on": "True",
-            "payload_off": "False",
-            "icon": "mdi:sd"
-        })
-
-    def register_network_sensors(self):
-        """Register network-related sensors with Home Assistant."""
-        base_topic = f"{STATE_TOPIC_PREFIX}/{self.hostname}/telemetry/network"
-
-        # Primary IP
-        self.publish_discovery_config("sensor", "ip_primary", {
-            "name": f"{self.device_name} IP Address",
-            "state_topic": base_topic,
-            "value_template": "{{ value_json.ip_primary }}",
-            "icon": "mdi:ip-network"
-        })
-
-        # WiFi IP
-        self.publish_discovery_config("sensor", "ip_wifi", {
-            "name": f"{self.device_name} WiFi IP",
-            "state_topic": base_topic,
-            "value_template": "{{ value_json.ip_wifi }}",
-            "icon": "mdi:wifi"
-        })
-
-        # Ethernet IP
-        self.publish_discovery_config("sensor", "ip_ethernet", {
-            "name": f"{self.device_name} Ethernet IP",
-            "state_topic": base_topic,
-            "value_template": "{{ value_json.ip_ethernet }}",
-            "icon": "mdi:ethernet"
-        })
-
-    def register_game_sensors(self):
-        """Register game-related sensors with Home Assistant."""
-        base_topic = f"{STATE_TOPIC_PREFIX}/{self.hostname}/telemetry/game"
-
-        # Current game name
-        self.publish_discovery_config("sensor", "current_game", {
-            "name": f"{self.device_name} Current Game",
-            "state_topic": base_topic,
-            "value_template": "{{ value_json.game_name }}",
-            "icon": "mdi:gamepad-variant"
-        })
-
-        # Current app ID
-        self.publish_discovery_config("sensor", "current_appid", {
-            "name": f"{self.device_name} Current App ID",
-            "state_topic": base_topic,
-            "value_template": "{{ value_json.app_id }}",
-            "icon": "mdi:identifier"
-        })
-
-        # Game running
-        self.publish_discovery_config("binary_sensor", "game_running", {
-            "name": f"{self.device_name} Game Running",
-            "state_topic": base_topic,
-            "value_template": "{{ value_json.is_running }}",
-            "payload_on": "True",
-            "payload_off": "False",
-            "icon": "mdi:gamepad-variant"
-        })
+        self.publish_discovery_configs([(component, object_id, config)])
+
+    def publish_discovery_configs(self, entries: list[tuple[str, str, dict]]):
+        """Publish several (component, object_id, config) discovery entries in one batch.
+
+        Configs already published unchanged by this instance are skipped. Inside
+        a `batch()` block the messages are held until the block exits.
+        """
+        self._sync_session()
+        messages = []
+        for component, object_id, config in entries:
+            topic, payload = self._discovery_message(component, object_id, config)
+            payload_hash = hash(payload)
+            if self._last_config_hash.get(topic) != payload_hash:
+                messages.append((topic, payload, payload_hash))
+        if self._pending is not None:
+            self._pending.extend(messages)
+        else:
+            self._send_discovery(messages)
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Collect discovery publishes made inside the block and send them in one pass on exit."""
+        self._pending = []
+        try:
+            yield self
+        finally:
+            pending, self._pending = self._pending, None
+            self._send_discovery(pending)
+
+    def _send_discovery(self, messages: list[tuple[str, bytes, int]]):
+        """Publish (topic, payload, hash) discovery messages, remembering hashes on success."""
+        if not messages:
+            return
+        if self.mqtt_client.publish_many([(topic, payload, True, 0) for topic, payload, _ in messages]):
+            for topic, _, payload_hash in messages:
+                self._last_config_hash[topic] = payload_hash
 
-    def register_download_sensors(self):
-        """Register download-related sensors with Home Assistant."""
-        base_topic = f"{STATE_TOPIC_PREFIX}/{self.hostname}/telemetry/download"
-
-        # Downloading
-        self.publish_discovery_config("binary_sensor", "downloading", {
-            "name": f"{self.device_name} Downloading",
-            "state_topic": base_topic,
-            "value_template": "{{ value_json.downloading }}",
-            "payload_on": "True",
-            "payload_off": "False",
-            "icon": "mdi:download"
-        })
+    def _sync_session(self) -> bool:
+        """Forget published hashes once the client has reconnected to the broker.
 
-        # Download progress
-        self.publish_discovery_config("sensor", "download_progress", {
-            "name": f"{self.device_name} Download Progress",
-            "state_topic": base_topic,
-            "unit_of_measurement": "%",
-            "value_template": "{{ value_json.download_progress }}",
-            "icon": "mdi:download"
-        })
+        Returns True if a new session was detected.
+        """
+        if self._session == self.mqtt_client.session:
+            return False
+        self._session = self.mqtt_client.session
+        self._last_config_hash.clear()
+        self._last_state_hash.clear()
+        return True
+
+    def check_new_session(self) -> bool:
+        """Whether the client has reconnected since this instance last published."""
+        return self._sync_session()
+
+    def _publish_state_payload(self, topic: str, payload: bytes, retain: bool) -> bool:
+        """Publish a state payload unless it matches the last one sent to the topic.
+
+        Returns True only when a new payload was published.
+        """
+        self._sync_session()
+        payload_hash = hash(payload)
+        if self._last_state_hash.get(topic) == payload_hash:
+            return False
+        if self.mqtt_client.publish(topic, payload, retain=retain):
+            self._last_state_hash[topic] = payload_hash
+            return True
+        return False
 
-        # Download rate
-        self.publish_discovery_config("sensor", "download_rate", {
-            "name": f"{self.device_name} Download Rate",
-            "state_topic": base_topic,
-            "unit_of_measurement": "Mbps",
-            "value_template": "{{ value_json.download_rate_mbps }}",
-            "icon": "mdi:speedometer"
-        })
+    def publish_states(self, telemetry: dict) -> bool:
+        """Publish each telemetry group to its own topic, e.g. {"battery": {...}, "disk": {...}}.
+
+        Groups whose payload matches the last one sent are skipped, and the rest
+        go out together through one publish_many call. Returns True only when
+        at least one new payload was published.
+        """
+        self._sync_session()
+        messages = []
+        hashes = []
+        for group, payload in telemetry.items():
+            topic = self._state_topics[group]
+            data = _dumps(payload)
+            payload_hash = hash(data)
+            if self._last_state_hash.get(topic) != payload_hash:
+                messages.append((topic, data, True, 0))
+                hashes.append((topic, payload_hash))
+        if not messages or not self.mqtt_client.publish_many(messages):
+            return False
+        self._last_state_hash.update(hashes)
+        return True
+
+    def publish_state_bundle(self, bundle: dict) -> bool:
+        """Publish all telemetry groups as a single JSON object, e.g. {"battery": {...}, "disk": {...}}.
+
+        Retained, so Home Assistant shows the last readings right after it
+        restarts instead of waiting for the next tick.
+        """
+        return self._publish_state_payload(self._bundle_topic, _dumps(bundle), True)
+
+    def register_sensors(self, groups: tuple[str, ...] = TELEMETRY_GROUPS, bundled: bool = False):
+        """Register the sensors for the given telemetry groups with Home Assistant.
+
+        `bundled` points them at the single telemetry/all topic instead of
+        their group's own topic.
+        """
+        # State is retained, so tie every entity to the status topic (and its
+        # Last Will); otherwise a Deck that's off keeps showing its last readings
+        availability = {}
+        if self.mqtt_client.status_topic:
+            availability = {
+                "availability_topic": self.mqtt_client.status_topic,
+                "payload_available": "online",
+                "payload_not_available": "offline"
+            }
+        entries = []
+        for group in groups:
+            if bundled:
+                state_topic = self._bundle_topic
+                value_prefix = f"value_json.{group}."
+            else:
+                state_topic = self._state_topics[group]
+                value_prefix = "value_json."
+            for component, object_id, name, field, extra in SENSOR_DEFINITIONS[group]:
+                config = {
+                    "name": f"{self.device_name} {name}",
+                    "state_topic": state_topic,
+                    "value_template": f"{{{{ {value_prefix}{field} }}}}",
+                    **availability,
+                    **extra
+                }
+                entries.append((component, object_id, config))
+        self.publish_discovery_configs(entries)
+
+    def unregister_sensors(self, groups: tuple[str, ...]):
+        """Remove the given groups' sensors from Home Assistant.
+
+        An empty retained config deletes the entity and clears the broker's
+        copy, so a disabled group doesn't linger with stale readings.
+        """
+        self._sync_session()
+        messages = []
+        empty_hash = hash(b"")
+        for group in groups:
+            for component, object_id, *_ in SENSOR_DEFINITIONS[group]:
+                topic = self._entity_ids[(component, object_id)][0]
+                if self._last_config_hash.get(topic) != empty_hash:
+                    messages.append((topic, b"", empty_hash))
+        if self._pending is not None:
+            self._pending.extend(messages)
+        else:
+            self._send_discovery(messages)
 
     def register_status_sensor(self):
         """Register connection status sensor with Home Assistant."""
         # Use the status topic from mqtt_client to maintain consistency
         status_topic = self.mqtt_client.status_topic
         if not status_topic:
-            decky.logger.warning("Status topic not configured, skipping status sensor registration")
+            _log.warning("Status topic not configured, skipping status sensor registration")
             return
 
         # Connection status
@@ -591,66 +1158,135 @@ class HomeAssistantDiscovery:
 class Plugin:
     """Main plugin class for Home Assistant MQTT integration."""
 
+    # Template for _get_default_settings; never handed out directly
+    _DEFAULTS = {
+        "mqtt_host": "",
+        "mqtt_port": 1883,
+        "mqtt_username": "",
+        "mqtt_password": "",
+        "hostname": "",
+        "publish_interval": 30,
+        "adaptive_polling": True,
+        "bundle_telemetry": False,
+        # Optional per-group overrides of publish_interval, e.g. {"network": 300}
+        "sensor_intervals": {},
+        "enabled_sensors": {
+            "battery": True,
+            "disk": True,
+            "network": True,
+            "game": True,
+            "download": True
+        }
+    }
+
     def __init__(self):
         self.loop = None
         self.mqtt_client = MQTTClient()
         self.discovery = None
         self.telemetry_task = None
-        self.settings = self._get_default_settings()
         self.running = False
+        # Set whenever settings change or the broker connection comes back, so the
+        # telemetry loop acts on it without sitting out the rest of the old interval
+        self._wake_loop = asyncio.Event()
+        # Connects and disconnects run on worker threads; this keeps them from overlapping
+        self._connection_lock = asyncio.Lock()
+        self._settings_path = Path(decky.DECKY_PLUGIN_SETTINGS_DIR) / SETTINGS_FILE
+        # Whether the settings directory is known to exist; saves a mkdir per save
+        self._settings_dir_ready = False
+        # Last reading per telemetry group, reused until that group is due again
+        self._telemetry = {}
+        self._set_settings(self._get_default_settings())
 
     def _get_default_settings(self) -> dict:
         """Get default settings."""
-        return {
-            "mqtt_host": "",
-            "mqtt_port": 1883,
-            "mqtt_username": "",
-            "mqtt_password": "",
-            "hostname": get_default_hostname(),
-            "publish_interval": 30,
-            "enabled_sensors": {
-                "battery": True,
-                "disk": True,
-                "network": True,
-                "game": True,
-                "download": True
-            }
-        }
+        settings = dict(self._DEFAULTS, hostname=get_default_hostname())
+        settings["enabled_sensors"] = dict(self._DEFAULTS["enabled_sensors"])
+        settings["sensor_intervals"] = {}
+        return settings
+
+    def _set_settings(self, settings: dict):
+        """Replace the settings and refresh the values derived from them."""
+        self.settings = settings
+        # Read on every tick, so resolved once per settings change
+        enabled = settings.get("enabled_sensors") or {}
+        self._enabled_groups = tuple(group for group in TELEMETRY_GROUPS if enabled.get(group, True))
+        # Coerced here, since the loop uses it as a wait_for timeout and a
+        # hand-edited settings file could hold anything
+        try:
+            interval = float(settings.get("publish_interval", 30))
+        except (TypeError, ValueError):
+            interval = 30
+        interval = max(interval, MIN_PUBLISH_INTERVAL)
+        overrides = settings.get("sensor_intervals")
+        if not isinstance(overrides, dict):
+            overrides = {}
+        self._group_intervals = {}
+        # The idle backoff never stretches past an interval the user set explicitly
+        self._idle_interval_cap = MAX_IDLE_INTERVAL
+        for group in self._enabled_groups:
+            try:
+                group_interval = max(float(overrides[group]), MIN_PUBLISH_INTERVAL)
+                self._idle_interval_cap = min(self._idle_interval_cap, group_interval)
+            except (KeyError, TypeError, ValueError):
+                group_interval = interval
+            self._group_intervals[group] = group_interval
+        # The loop ticks at the fastest group's pace; slower groups sit ticks out
+        self._publish_interval = min(self._group_intervals.values(), default=interval)
+        # Collect every group again on the next tick
+        self._collected_at = {}
+        self._adaptive_polling = bool(settings.get("adaptive_polling", True))
+        self._bundle_telemetry = bool(settings.get("bundle_telemetry", False))
+        self._wake_loop.set()
 
     def _get_settings_path(self) -> Path:
         """Get the path to the settings file."""
-        return Path(decky.DECKY_PLUGIN_SETTINGS_DIR) / SETTINGS_FILE
+        return self._settings_path
 
     def _load_settings(self):
         """Load settings from file."""
-        settings_path = self._get_settings_path()
-        if settings_path.exists():
-            try:
-                with open(settings_path, "r") as f:
-                    loaded = json.load(f)
-                    # Merge with defaults to ensure all keys exist
-                    for key, value in self._get_default_settings().items():
-                        if key not in loaded:
-                            loaded[key] = value
-                        elif key == "enabled_sensors" and isinstance(value, dict):
-                            for sensor_key, sensor_value in value.items():
-                                if sensor_key not in loaded[key]:
-                                    loaded[key][sensor_key] = sensor_value
-                    self.settings = loaded
-                    decky.logger.info("Settings loaded successfully")
-            except Exception as e:
-                decky.logger.error(f"Error loading settings: {e}")
-
-    def _save_settings(self):
-        """Save settings to file."""
-        settings_path = self._get_settings_path()
         try:
-            settings_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(settings_path, "w") as f:
-                json.dump(self.settings, f, indent=2)
-            decky.logger.info("Settings saved successfully")
+            loaded = _loads(self._settings_path.read_bytes())
+            # Merge with defaults to ensure all keys exist
+            defaults = self._get_default_settings()
+            enabled = loaded.get("enabled_sensors")
+            merged = defaults | loaded
+            merged["enabled_sensors"] = defaults["enabled_sensors"] | (enabled if isinstance(enabled, dict) else {})
+            self._set_settings(merged)
+            self._settings_dir_ready = True
+            _log.info("Settings loaded successfully")
+        except FileNotFoundError:
+            # First run; keep the defaults
+            pass
+        except Exception as e:
+            _log.error("Error loading settings: %s", e)
+
+    def _write_settings_file(self, data: bytes):
+        """Atomically replace the settings file, so a crash mid-save can't leave it torn."""
+        tmp_path = self._settings_path.with_suffix(".json.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._settings_path)
+
+    def _save_settings(self) -> bool:
+        """Save settings to file, returning whether the write succeeded."""
+        try:
+            data = _dumps_indented(self.settings)
+            if not self._settings_dir_ready:
+                self._settings_path.parent.mkdir(parents=True, exist_ok=True)
+                self._settings_dir_ready = True
+            try:
+                self._write_settings_file(data)
+            except FileNotFoundError:
+                # The directory was removed underneath us
+                self._settings_path.parent.mkdir(parents=True, exist_ok=True)
+                self._write_settings_file(data)
+            _log.info("Settings saved successfully")
+            return True
         except Exception as e:
-            decky.logger.error(f"Error saving settings: {e}")
+            _log.error("Error saving settings: %s", e)
+            return False
 
     async def get_settings(self) -> dict:
         """Get current settings (callable from frontend)."""
@@ -667,8 +1303,14 @@ class Plugin:
             if settings.get("mqtt_password") == "****":
                 settings["mqtt_password"] = self.settings.get("mqtt_password", "")
 
-            self.settings = settings
-            self._save_settings()
+            reconnect = any(settings.get(key) != self.settings.get(key) for key in BROKER_KEYS)
+            self._set_settings(settings)
+            saved = self._save_settings()
+
+            if self.mqtt_client.connected and not reconnect:
+                # Same broker and identity; just announce any newly enabled sensors
+                await self._register_sensors()
+                return saved
 
             # Reconnect if settings changed
             if self.mqtt_client.connected:
@@ -676,24 +1318,25 @@ class Plugin:
             if self.settings.get("mqtt_host"):
                 await self.connect_mqtt()
 
-            return True
+            return saved
         except Exception as e:
-            decky.logger.error(f"Error saving settings: {e}")
+            _log.error("Error saving settings: %s", e)
             return False
 
     async def connect_mqtt(self) -> dict:
         """Connect to MQTT broker (callable from frontend)."""
         try:
             hostname = self.settings.get("hostname", get_default_hostname())
-            self.mqtt_client.configure(
-                self.settings.get("mqtt_host", ""),
-                self.settings.get("mqtt_port", 1883),
-                self.settings.get("mqtt_username", ""),
-                self.settings.get("mqtt_password", ""),
-                hostname
-            )
-
-            success = self.mqtt_client.connect()
+            async with self._connection_lock:
+                self.mqtt_client.configure(
+                    self.settings.get("mqtt_host", ""),
+                    self.settings.get("mqtt_port", 1883),
+                    self.settings.get("mqtt_username", ""),
+                    self.settings.get("mqtt_password", ""),
+                    hostname
+                )
+                # Off the event loop: the handshake and CONNACK wait can take seconds on bad Wi-Fi
+                success = await asyncio.to_thread(self.mqtt_client.connect)
 
             if success:
                 # Initialize discovery and register sensors
@@ -702,36 +1345,45 @@ class Plugin:
                     hostname
                 )
                 await self._register_sensors()
-                decky.logger.info("MQTT connected and sensors registered")
+                _log.info("MQTT connected and sensors registered")
 
             return {"success": success, "connected": self.mqtt_client.connected}
         except Exception as e:
-            decky.logger.error(f"Error connecting to MQTT: {e}")
+            _log.error("Error connecting to MQTT: %s", e)
             return {"success": False, "error": str(e), "connected": False}
 
     async def disconnect_mqtt(self) -> dict:
         """Disconnect from MQTT broker (callable from frontend)."""
         try:
-            self.mqtt_client.disconnect()
+            async with self._connection_lock:
+                # Off the event loop: waits for the broker to ack the offline status
+                await asyncio.to_thread(self.mqtt_client.disconnect)
             return {"success": True, "connected": False}
         except Exception as e:
-            decky.logger.error(f"Error disconnecting from MQTT: {e}")
+            _log.error("Error disconnecting from MQTT: %s", e)
             return {"success": False, "error": str(e)}
 
     async def test_connection(self) -> dict:
         """Test MQTT connection (callable from frontend)."""
         try:
-            test_client = MQTTClient()
-            hostname = self.settings.get("hostname", get_default_hostname())
-            test_client.configure(
+            broker = (
                 self.settings.get("mqtt_host", ""),
                 self.settings.get("mqtt_port", 1883),
                 self.settings.get("mqtt_username", ""),
-                self.settings.get("mqtt_password", ""),
-                hostname
+                self.settings.get("mqtt_password", "")
             )
-            success = test_client.connect()
-            test_client.disconnect()
+            live = self.mqtt_client
+            if live.connected and (live.host, live.port, live.username, live.password) == broker:
+                # The live connection already answers the question without another handshake
+                return {"success": True}
+
+            # No hostname: the throwaway client must not set a Last Will or publish
+            # online/offline on the deck's real status topic
+            test_client = MQTTClient()
+            test_client.configure(*broker)
+            # Off the event loop: the connect can wait up to MQTT_CONNECT_TIMEOUT for a CONNACK
+            success = await asyncio.to_thread(test_client.connect)
+            await asyncio.to_thread(test_client.disconnect)
             return {"success": success}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -745,94 +1397,149 @@ class Plugin:
         if not self.discovery:
             return
 
-        # Always register status sensor
-        self.discovery.register_status_sensor()
-
-        enabled = self.settings.get("enabled_sensors", {})
-
-        if enabled.get("battery", True):
-            self.discovery.register_battery_sensors()
-
-        if enabled.get("disk", True):
-            self.discovery.register_disk_sensors()
-
-        if enabled.get("network", True):
-            self.discovery.register_network_sensors()
-
-        if enabled.get("game", True):
-            self.discovery.register_game_sensors()
-
-        if enabled.get("download", True):
-            self.discovery.register_download_sensors()
+        # Send every discovery config in a single publish pass
+        with self.discovery.batch():
+            # Always register status sensor
+            self.discovery.register_status_sensor()
+            self.discovery.register_sensors(self._enabled_groups, self._bundle_telemetry)
+            self.discovery.unregister_sensors(
+                tuple(group for group in TELEMETRY_GROUPS if group not in self._enabled_groups)
+            )
 
-    async def _publish_telemetry(self):
-        """Publish telemetry data to MQTT."""
+    def _due_groups(self) -> tuple[str, ...]:
+        """Enabled groups whose own interval has run out since they were last collected."""
+        now = time.monotonic()
+        # Half a tick of slack, so timer jitter doesn't push a group a whole tick late
+        slack = self._publish_interval / 2
+        return tuple(
+            group for group in self._enabled_groups
+            if group not in self._collected_at
+            or now - self._collected_at[group] >= self._group_intervals[group] - slack
+        )
+
+    async def _publish_telemetry(self, force: bool = False) -> bool:
+        """Publish telemetry data to MQTT, returning whether any reading changed.
+
+        Only the groups that are due are collected; the others are republished
+        from their last reading. `force` collects every enabled group.
+        """
         if not self.mqtt_client.connected or not self.discovery:
-            return
-
-        # Publish heartbeat to keep status online
-        self.mqtt_client.publish_heartbeat()
-
-        enabled = self.settings.get("enabled_sensors", {})
-
-        if enabled.get("battery", True):
-            battery_info = TelemetryCollector.get_battery_info()
-            self.discovery.publish_state("battery", battery_info)
-
-        if enabled.get("disk", True):
-            disk_info = TelemetryCollector.get_disk_info()
-            self.discovery.publish_state("disk", disk_info)
-
-        if enabled.get("network", True):
-            network_info = TelemetryCollector.get_network_info()
-            self.discovery.publish_state("network", network_info)
+            return False
 
-        if enabled.get("game", True):
-            game_info = TelemetryCollector.get_current_game()
-            self.discovery.publish_state("game", game_info)
+        # Don't pile more onto paho's queue while the broker isn't draining it
+        pending = self.mqtt_client.pending_publishes()
+        if pending > MAX_PENDING_PUBLISHES:
+            _log.warning("MQTT backpressure (%s messages pending), skipping telemetry tick", pending)
+            return False
 
-        if enabled.get("download", True):
-            download_info = TelemetryCollector.get_download_info()
-            self.discovery.publish_state("download", download_info)
+        if self.discovery.check_new_session():
+            # paho reconnected on its own; a broker restarted without persistence
+            # has lost the retained discovery configs, so send them again
+            await self._register_sensors()
+
+        groups = self._enabled_groups if force else self._due_groups()
+        if groups:
+            fresh = await TelemetryCollector.collect_all(groups)
+            now = time.monotonic()
+            for group in groups:
+                if group in fresh:
+                    self._collected_at[group] = now
+                    self._telemetry[group] = fresh[group]
+                else:
+                    # Due but not collected; don't keep republishing an old reading as current
+                    self._telemetry.pop(group, None)
+        bundle = {group: self._telemetry[group] for group in self._enabled_groups if group in self._telemetry}
+
+        if self._bundle_telemetry:
+            # One publish per tick instead of one per telemetry group
+            changed = bool(bundle) and self.discovery.publish_state_bundle(bundle)
+        else:
+            # Only the groups that changed, in one batch
+            changed = self.discovery.publish_states(bundle)
+
+        # Publish heartbeat to keep status online, unless fresh telemetry just
+        # went out this tick; on_connect already re-announces online on reconnects
+        if not changed:
+            self.mqtt_client.publish_heartbeat()
+        return changed
+
+    def _power_multiplier(self) -> int:
+        """Stretch factor for the publish interval on a low battery.
+
+        1x while charging or above 20%, 2x down to 10%, 4x below that, and 1x
+        when there is no battery reading (e.g. the battery group is disabled).
+        """
+        if not self._adaptive_polling or "battery" not in self._enabled_groups:
+            return 1
+        # Last reading the telemetry tick collected; never read the battery
+        # from the event loop here
+        battery = self._telemetry.get("battery") or {}
+        percent = battery.get("percent")
+        if percent is None or battery.get("charging") or percent > 20:
+            return 1
+        return 2 if percent > 10 else 4
 
     async def _telemetry_loop(self):
-        """Main telemetry publishing loop."""
+        """Main telemetry publishing loop.
+
+        While successive ticks find nothing new to publish, the interval doubles
+        (up to 8x, capped at MAX_IDLE_INTERVAL or the shortest interval set in
+        sensor_intervals) and snaps back on the next change.
+        A settings change cuts the wait short and publishes right away. After an
+        error the next attempt comes after 2, 4, 8... seconds, up to the interval.
+        While the broker connection is down the loop just waits; paho's reconnect
+        wakes it. With adaptive polling on, a low battery stretches the interval further.
+        """
+        idle_ticks = 0
+        failures = 0
+        self._wake_loop.clear()
         while self.running:
+            changed = True
             try:
                 if self.mqtt_client.connected:
-                    await self._publish_telemetry()
+                    changed = await self._publish_telemetry()
+                failures = 0
             except Exception as e:
-                decky.logger.error(f"Error in telemetry loop: {e}")
-
-            interval = self.settings.get("publish_interval", 30)
-            await asyncio.sleep(interval)
+                failures += 1
+                _log.error("Error in telemetry loop: %s", e)
+
+            idle_ticks = 0 if changed else idle_ticks + 1
+            interval = self._publish_interval
+            if failures:
+                interval = min(interval, 2 ** min(failures, 8))
+            else:
+                interval *= self._power_multiplier()
+                if idle_ticks:
+                    interval = max(interval, min(interval * 2 ** min(idle_ticks, 3), self._idle_interval_cap))
+            try:
+                await asyncio.wait_for(self._wake_loop.wait(), interval)
+                idle_ticks = 0
+            except asyncio.TimeoutError:
+                pass
+            self._wake_loop.clear()
 
     async def publish_now(self) -> dict:
         """Manually trigger telemetry publish (callable from frontend)."""
         try:
             if not self.mqtt_client.connected:
                 return {"success": False, "error": "Not connected to MQTT"}
-            await self._publish_telemetry()
+            await self._publish_telemetry(force=True)
             return {"success": True}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
     async def get_telemetry(self) -> dict:
         """Get current telemetry data (callable from frontend)."""
-        return {
-            "battery": TelemetryCollector.get_battery_info(),
-            "disk": TelemetryCollector.get_disk_info(),
-            "network": TelemetryCollector.get_network_info(),
-            "game": TelemetryCollector.get_current_game(),
-            "download": TelemetryCollector.get_download_info()
-        }
+        return await TelemetryCollector.collect_all()
 
     async def _main(self):
         """Main plugin entry point."""
         self.loop = asyncio.get_event_loop()
         self.running = True
+        # on_connect runs on paho's thread; hop to the loop to wake the telemetry task
+        self.mqtt_client.on_connected = functools.partial(self.loop.call_soon_threadsafe, self._wake_loop.set)
 
-        decky.logger.info("Home Assistant MQTT Plugin starting...")
+        _log.info("Home Assistant MQTT Plugin starting...")
 
         # Load settings
         self._load_settings()
@@ -844,11 +1551,11 @@ class Plugin:
         # Start telemetry loop
         self.telemetry_task = self.loop.create_task(self._telemetry_loop())
 
-        decky.logger.info("Home Assistant MQTT Plugin started")
+        _log.info("Home Assistant MQTT Plugin started")
 
     async def _unload(self):
         """Called when plugin is being unloaded."""
-        decky.logger.info("Home Assistant MQTT Plugin unloading...")
+        _log.info("Home Assistant MQTT Plugin unloading...")
         self.running = False
 
         if self.telemetry_task:
@@ -858,12 +1565,13 @@ class Plugin:
             except asyncio.CancelledError:
                 pass
 
-        self.mqtt_client.disconnect()
-        decky.logger.info("Home Assistant MQTT Plugin unloaded")
+        await self.disconnect_mqtt()
+        TelemetryCollector.close()
+        _log.info("Home Assistant MQTT Plugin unloaded")
 
     async def _uninstall(self):
         """Called when plugin is being uninstalled."""
-        decky.logger.info("Home Assistant MQTT Plugin uninstalling...")
+        _log.info("Home Assistant MQTT Plugin uninstalling...")
         # Clean up settings file if desired
         # settings_path = self._get_settings_path()
         # if settings_path.exists():
@@ -871,5 +1579,5 @@ class Plugin:
 
     async def _migration(self):
         """Migrations that should be performed before entering `_main()`."""
-        decky.logger.info("Running migrations...")
+        _log.info("Running migrations...")
         # No migrations needed for fresh install
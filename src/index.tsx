@@ -43,6 +43,9 @@ interface Settings {
   mqtt_password: string;
   hostname: string;
   publish_interval: number;
+  adaptive_polling: boolean;
+  bundle_telemetry: boolean;
+  sensor_intervals?: Partial<Record<keyof EnabledSensors, number>>;
   enabled_sensors: EnabledSensors;
   connected?: boolean;
 }
@@ -112,6 +115,8 @@ const defaultSettings: Settings = {
   mqtt_password: "",
   hostname: "steamdeck",
   publish_interval: 30,
+  adaptive_polling: true,
+  bundle_telemetry: false,
   enabled_sensors: {
     battery: true,
     disk: true,
@@ -515,6 +520,26 @@ function Content() {
             </ButtonItem>
           </PanelSectionRow>
         )}
+        {showAdvanced && (
+          <PanelSectionRow>
+            <ToggleField
+              label="Adaptive Polling"
+              description="Publish less often when the battery is low"
+              checked={settings.adaptive_polling}
+              onChange={(value) => updateSetting("adaptive_polling", value)}
+            />
+          </PanelSectionRow>
+        )}
+        {showAdvanced && (
+          <PanelSectionRow>
+            <ToggleField
+              label="Bundle Telemetry"
+              description="Publish all sensors as one message instead of one topic per group"
+              checked={settings.bundle_telemetry}
+              onChange={(value) => updateSetting("bundle_telemetry", value)}
+            />
+          </PanelSectionRow>
+        )}
       </PanelSection>
 
       {/* Actions */}